@@ -0,0 +1,44 @@
+import sys
+
+from program import PartialAggregate, Report, Console
+
+USAGE = """Использование:
+    python aggregate.py export <csv файл шарда> <файл агрегатов>
+    python aggregate.py merge <название профессии> <файл агрегатов> [<файл агрегатов> ...]"""
+
+
+def export(file_name: str, output: str):
+    """Сохраняет частичные агрегаты шарда в файл
+    :param file_name: Название csv файла шарда
+    :param output: Название файла агрегатов
+    """
+    aggregate = PartialAggregate.from_csv(file_name)
+    aggregate.save(output)
+    print(f'Сохранены агрегаты {aggregate.len} вакансий в {output}')
+
+
+def merge(vacancy: str, file_names: list):
+    """Объединяет файлы агрегатов в порядке шардов, выводит статистику в консоль и генерирует excel отчет
+    :param vacancy: Название профессии для фильтрации
+    :param file_names: Названия файлов агрегатов
+    """
+    aggregate = PartialAggregate()
+    for file_name in file_names:
+        aggregate.merge(PartialAggregate.load(file_name))
+
+    salaries_all = aggregate.get_vacancies_years()
+    salaries_filter = aggregate.get_vacancies_years(vacancy)
+    fraction, cities_salaries = aggregate.get_vacancies_cities()
+
+    Console.write_console(salaries_all, salaries_filter, fraction, cities_salaries)
+    Report(vacancy, salaries_all, salaries_filter, fraction, cities_salaries).generate_excel()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 4 and sys.argv[1] == 'export':
+        export(sys.argv[2], sys.argv[3])
+    elif len(sys.argv) >= 4 and sys.argv[1] == 'merge':
+        merge(sys.argv[2], sys.argv[3:])
+    else:
+        print(USAGE)
+        sys.exit(1)
@@ -0,0 +1,37 @@
+import sys
+import time
+
+from program import DataSet, SqliteDataSet
+
+
+def measure(func):
+    """Замеряет время выполнения функции
+    :param func: Функция без аргументов
+    :return: Кортеж из результата функции и времени выполнения в секундах
+    """
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def benchmark(dataset_class, file_name: str, vacancy: str):
+    """Замеряет время загрузки и запросов для хранилища вакансий
+    :param dataset_class: Класс хранилища: DataSet или SqliteDataSet (база во временном файле на диске)
+    :param file_name: Название csv файла
+    :param vacancy: Название профессии для фильтрации
+    """
+    dataset, load = measure(lambda: dataset_class(file_name))
+    _, years = measure(lambda: dataset.get_vacancies_years(vacancy))
+    _, cities = measure(dataset.get_vacancies_cities)
+    if hasattr(dataset, 'close'):
+        dataset.close()
+
+    print(f'{dataset_class.__name__}: загрузка {load:.3f} с, по годам {years:.3f} с, по городам {cities:.3f} с')
+
+
+if __name__ == '__main__':
+    name = sys.argv[1] if len(sys.argv) > 1 else input("Введите название файла: ")
+    profession = sys.argv[2] if len(sys.argv) > 2 else input("Введите название профессии: ")
+
+    benchmark(DataSet, name, profession)
+    benchmark(SqliteDataSet, name, profession)
@@ -1,12 +1,24 @@
 import csv
+import gzip
+import hashlib
+import json
 import math
+import os
+import random
 import re
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 
+from concurrent.futures import ProcessPoolExecutor
 from functools import reduce
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator
+from matplotlib.figure import Figure
 from openpyxl import Workbook
 from openpyxl.styles import Side, Border, Font
 from openpyxl.styles.numbers import FORMAT_PERCENTAGE_00
@@ -44,6 +56,44 @@ class OtherMethods:
         label = re.sub(spaces, '\n', label)
         return re.sub(line, '-\n', label)
 
+    @staticmethod
+    def get_structured_salaries(rows: List[Tuple[str, float, int]]) -> Dict[str, List[int]]:
+        """Создает словарь с ключами-годами и значениями - массивами из зарплат
+        :param rows: Список из года, суммы зарплат и количества вакансий
+        :return: Словарь с ключами-годами и значениями - массивами из зарплат
+
+        >>> OtherMethods.get_structured_salaries([('2021', 300.0, 2), ('2022', 0, 0)])
+        {'2021': [150, 2], '2022': [0, 0]}
+        """
+        return {year: [math.floor(summ / count) if count > 0 else 0, count] for year, summ, count in rows}
+
+    @staticmethod
+    def get_structured_cities(rows: List[Tuple[str, float, float]], total: int) \
+            -> Tuple[List[List[float]], List[List[int]]]:
+        """Создает кортеж из листов с долями вакансий и уровнем зарплат по городам,
+        города с долей меньше 1% пропускаются
+        :param rows: Список из города, суммы зарплат и количества вакансий в порядке появления городов
+        :param total: Общее количество вакансий
+        :return: Кортеж из листов с долями вакансий и уровнем зарплат по городам
+
+        >>> OtherMethods.get_structured_cities([('Пермь', 100.0, 1), ('Москва', 900.0, 3), ('Омск', 1.0, 0.001)], 4)
+        ([['Москва', 0.75], ['Пермь', 0.25]], [['Москва', 300], ['Пермь', 100]])
+        """
+        cities_s = []
+        fract = []
+
+        for area, summ, count in rows:
+            percent = round(count / total, 4)
+            if percent < 0.01:
+                continue
+
+            cities_s.append([area, math.floor(summ / count)])
+            fract.append([area, percent])
+
+        fract.sort(key=lambda x: x[1], reverse=True)
+        cities_s.sort(key=lambda x: x[1], reverse=True)
+        return fract, cities_s
+
 
 class Salary:
     """Класс для представления зарплаты"""
@@ -149,6 +199,10 @@ class Vacancy:
         """Возвращает город, в котором размещена данная вакансия"""
         return self.__area_name
 
+    def get_name(self) -> str:
+        """Возвращает название вакансии"""
+        return self.__name
+
     def set_value(self, key, value):
         """Метод для инициализации приватных полей объекта
         :param key: Название поля
@@ -175,13 +229,131 @@ class Vacancy:
         self.__salary = Salary([self.__salary_from, self.__salary_to, self.__salary_currency])
 
 
+class BloomFilter:
+    """Класс, представляющий фильтр Блума - множество с ограниченной памятью и ложноположительными ответами"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        """Инициализирует объект класса BloomFilter
+        :param capacity: Ожидаемое количество элементов
+        :param error_rate: Допустимая доля ложноположительных ответов
+
+        >>> bloom = BloomFilter(1000, 0.01)
+        >>> bloom.add(b'vacancy')
+        False
+        >>> bloom.add(b'vacancy')
+        True
+        >>> BloomFilter(0, 0.01)
+        Traceback (most recent call last):
+        ...
+        ValueError: Ожидаемое количество элементов фильтра Блума должно быть положительным: 0
+        """
+        if capacity <= 0:
+            raise ValueError(f'Ожидаемое количество элементов фильтра Блума должно быть положительным: {capacity}')
+        if not 0 < error_rate < 1:
+            raise ValueError(f'Доля ложноположительных ответов фильтра Блума должна быть в интервале (0, 1): {error_rate}')
+
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.__bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: bytes) -> bool:
+        """Добавляет элемент в фильтр
+        :param item: Элемент
+        :return: Был ли элемент (возможно) добавлен ранее
+        """
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        exists = True
+
+        for i in range(self.hashes):
+            bit = (first + i * second) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.__bits[byte] & mask:
+                exists = False
+                self.__bits[byte] |= mask
+
+        return exists
+
+    def get_memory(self) -> int:
+        """Возвращает размер памяти, занимаемой фильтром, в байтах"""
+        return sys.getsizeof(self.__bits)
+
+
+class Deduplicator:
+    """Класс для удаления повторно размещенных вакансий при чтении csv файла.
+    Ключ вакансии - хэш значений выбранных столбцов. Просмотренные ключи хранятся
+    в множестве 256-битных хэшей, а если задано ожидаемое количество строк - в фильтре Блума.
+    """
+    columns = ['name', 'employer_name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+    def __init__(self, columns: List[str] = None, capacity: int = None, error_rate: float = 0.001):
+        """Инициализирует объект класса Deduplicator
+        :param columns: Названия столбцов, составляющих ключ вакансии
+        :param capacity: Ожидаемое количество строк для фильтра Блума, None - множество хэшей
+        :param error_rate: Доля ложноположительных ответов фильтра Блума
+
+        >>> title = ['name', 'employer_name', 'area_name']
+        >>> dedup = Deduplicator(['name', 'area_name'])
+        >>> dedup.is_duplicate(['Аналитик', 'Яндекс', 'Москва'], title)
+        False
+        >>> dedup.is_duplicate(['Аналитик', 'Сбер', 'Москва'], title)
+        True
+        >>> dedup.removed
+        1
+        """
+        self.columns = columns if columns is not None else Deduplicator.columns
+        self.removed = 0
+        self.__indexes = None
+        self.__title = None
+        self.__seen = set() if capacity is None else BloomFilter(capacity, error_rate)
+
+    def is_duplicate(self, row: List[str], title: List[str]) -> bool:
+        """Проверяет, встречалась ли вакансия раньше, и запоминает ее
+        :param row: Строка с вакансией из csv файла
+        :param title: Названия столбцов csv файла
+        :return: Является ли вакансия повтором
+        """
+        # Позиции столбцов пересчитываются для каждого нового заголовка: файлы могут отличаться порядком столбцов
+        if title is not self.__title:
+            missing = [column for column in self.columns if column not in title]
+            if missing:
+                raise ValueError(f'В csv файле нет столбцов для ключа вакансии: {", ".join(missing)}')
+            self.__indexes = [title.index(column) for column in self.columns]
+            self.__title = title
+
+        item = '\x1f'.join(row[i].strip() for i in self.__indexes).encode('utf-8')
+
+        if isinstance(self.__seen, BloomFilter):
+            exists = self.__seen.add(item)
+        else:
+            key = hashlib.blake2b(item, digest_size=32).digest()
+            exists = key in self.__seen
+            self.__seen.add(key)
+
+        if exists:
+            self.removed += 1
+        return exists
+
+    def get_memory(self) -> int:
+        """Возвращает размер памяти, занимаемой просмотренными ключами, в байтах"""
+        if isinstance(self.__seen, BloomFilter):
+            return self.__seen.get_memory()
+        return sys.getsizeof(self.__seen) + len(self.__seen) * sys.getsizeof(b'\0' * 32)
+
+    def __str__(self) -> str:
+        """Возвращает статистику удаления повторов"""
+        return f'Удалено повторяющихся вакансий: {self.removed}, использовано памяти: {self.get_memory()} байт'
+
+
 class DataSet:
     """Класс, представляющий набор данных обо всех вакансиях"""
 
-    def __init__(self, file_name: str):
+    def __init__(self, file_name: str, dedup=None):
         """
         Инициализирует объект Dataset
         :param file_name: Название файла
+        :param dedup: Объект Deduplicator для удаления повторяющихся вакансий, None - без удаления
         >>> type(DataSet('tests/test.csv')).__name__
         'DataSet'
         >>> DataSet('tests/test.csv').len
@@ -191,31 +363,40 @@ class DataSet:
         self.__title = None
         self.__vacancies_years = {}
         self.__vacancies_areas = {}
+        self.dedup = dedup
         self.len = 0
 
+        for title, row in DataSet.read_rows(file_name):
+            self.__title = title
+            if self.dedup is not None and self.dedup.is_duplicate(row, self.__title):
+                continue
+
+            self.validate_vacancy(row)
+            self.len += 1
+
+    @staticmethod
+    def read_rows(file_name: str) -> Iterator[Tuple[List[str], List[str]]]:
+        """Читает csv файл, пропуская строки с незаполненными полями
+        :param file_name: Название файла
+        :return: Генератор пар из названий столбцов и строки с вакансией
+        """
         with open(file_name, mode='r', encoding='utf-8-sig') as vacancies:
             file_reader = csv.reader(vacancies, delimiter=",")
-            is_title = False
+            title = next(file_reader, None)
 
             for row in file_reader:
-                if not is_title:
-                    self.__title = row
-                    is_title = True
-                    continue
-
-                if row.count('') != 0 or len(row) < len(self.__title) - 1:
+                if row.count('') != 0 or len(row) < len(title) - 1:
                     continue
-
-                self.validate_vacancy(row)
-                self.len += 1
+                yield title, row
 
     def get_vacancies_years(self, func=None) -> Dict[str, List[int]]:
         """Создает словарь с ключами-годами и значениями - массивами из зарплат в соответствии с фильтрующей функцией
-        :param func: Фильтрующая функция
+        :param func: Фильтрующая функция или подстрока названия вакансии
         :return: Словарь с массивами зарплат по годам
         """
         if func is None:
             return DataSet.get_structured_salaries(self.__vacancies_years)
+        func = DataSet.get_filter(func)
         dict_vac_years = {}
 
         for year in self.__vacancies_years.keys():
@@ -226,28 +407,33 @@ class DataSet:
 
         return DataSet.get_structured_salaries(dict_vac_years)
 
+    @staticmethod
+    def get_filter(func):
+        """Получает фильтрующую функцию для вакансий
+        :param func: Фильтрующая функция или подстрока названия вакансии
+        :return: Фильтрующая функция
+
+        >>> title = ['name', 'salary_from', 'salary_to', 'salary_currency']
+        >>> DataSet.get_filter('Руководитель')(Vacancy(['Руководитель отдела', '10', '20', 'RUR'], title))
+        True
+        """
+        if isinstance(func, str):
+            return lambda vacancy: vacancy.is_suitible(func)
+        return func
+
     def get_vacancies_cities(self) -> Tuple[List[List[float]], List[List[int]]]:
         """Создает кортеж из листов с долями вакансий и уровнем зарплат по городам
         :return: Кортеж из листов с долями вакансий и уровнем зарплат по городам
         """
-        cities_s = []
-        fract = []
+        rows = []
 
         for key, value in self.__vacancies_areas.items():
-            percent = round(len(value) / self.len, 4)
-            if percent < 0.01:
-                continue
-
             summ = 0
-            for vacancy in self.__vacancies_areas[key]:
+            for vacancy in value:
                 summ += vacancy.get_salary()
+            rows.append((key, summ, len(value)))
 
-            cities_s.append([key, math.floor(summ / len(value))])
-            fract.append([key, percent])
-
-        fract.sort(key=lambda x: x[1], reverse=True)
-        cities_s.sort(key=lambda x: x[1], reverse=True)
-        return fract, cities_s
+        return OtherMethods.get_structured_cities(rows, self.len)
 
     def validate_vacancy(self, row: List[str]):
         """Парсит валидную строку csv файла
@@ -269,39 +455,617 @@ class DataSet:
         :param vacancies: Датасет вакансий
         :return: Словарь с ключами-годами и значениями - массивами из зарплат
         """
-        dict_salaries = {}
+        rows = []
 
-        for i, year in enumerate(vacancies.keys()):
+        for year, value in vacancies.items():
             summ = 0
-            for vacancy in vacancies[year]:
+            for vacancy in value:
                 summ += vacancy.get_salary()
-            dict_salaries[year] = [
-                math.floor(summ / len(vacancies[year])) if len(vacancies[year]) > 0 else 0,
-                len(vacancies[year])
-            ]
+            rows.append((year, summ, len(value)))
+
+        return OtherMethods.get_structured_salaries(rows)
+
+
+class SqliteDataSet:
+    """Класс, представляющий набор данных обо всех вакансиях, хранящийся в базе SQLite.
+    Подходит для файлов, не помещающихся в оперативную память. Соединение с базой закрывается
+    методом close или при выходе из блока with.
+    """
+
+    def __init__(self, file_name: str, db_name: str = None, batch_size: int = 10000, dedup=None):
+        """Инициализирует объект SqliteDataSet и загружает в базу вакансии из csv файла
+        :param file_name: Название файла
+        :param db_name: Путь к файлу базы данных, существующие таблицы будут пересозданы,
+            None - временный файл, удаляемый при закрытии
+        :param batch_size: Количество вакансий, добавляемых в базу одной транзакцией
+        :param dedup: Объект Deduplicator для удаления повторяющихся вакансий, None - без удаления
+        """
+        self.__temp_name = None
+        if db_name is None:
+            descriptor, db_name = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(descriptor)
+            self.__temp_name = db_name
+
+        self.__connection = sqlite3.connect(db_name)
+        self.__fts = True
+        self.__years: Dict[str, List[float]] = {}
+        self.dedup = dedup
+        self.len = 0
+
+        self.__create_tables()
+        batch = []
+
+        for title, row in DataSet.read_rows(file_name):
+            if self.dedup is not None and self.dedup.is_duplicate(row, title):
+                continue
+
+            vacancy = Vacancy(row, title)
+            batch.append((vacancy.get_name(), vacancy.get_date(), vacancy.get_area(), vacancy.get_salary()))
+
+            # Итоги по всем годам считаются при загрузке, они же задают порядок лет для запросов с фильтром
+            total = self.__years.setdefault(vacancy.get_date(), [0, 0])
+            total[0] += vacancy.get_salary()
+            total[1] += 1
+
+            if len(batch) >= batch_size:
+                self.__insert(batch)
+                batch = []
+
+        self.__insert(batch)
+        self.__create_indexes()
+
+    def __enter__(self):
+        """Возвращает сам объект для использования в блоке with"""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Закрывает соединение с базой при выходе из блока with"""
+        self.close()
+
+    def close(self):
+        """Закрывает соединение с базой и удаляет временный файл базы"""
+        self.__connection.close()
+        if self.__temp_name is not None and os.path.exists(self.__temp_name):
+            os.remove(self.__temp_name)
+
+    def __create_tables(self):
+        """Создает пустые таблицы для вакансий"""
+        with self.__connection:
+            self.__connection.executescript("""
+                DROP TABLE IF EXISTS vacancies_fts;
+                DROP TABLE IF EXISTS vacancies;
+                CREATE TABLE vacancies (id INTEGER PRIMARY KEY, name TEXT, year TEXT, area TEXT, salary REAL);
+            """)
+
+    def __insert(self, batch: List[Tuple[str, str, str, float]]):
+        """Добавляет пачку вакансий в базу одной транзакцией
+        :param batch: Список вакансий: название, год, город, зарплата в рублях
+        """
+        with self.__connection:
+            self.__connection.executemany('INSERT INTO vacancies (name, year, area, salary) VALUES (?, ?, ?, ?)', batch)
+        self.len += len(batch)
+
+    def __create_indexes(self):
+        """Строит индексы по году и городу и полнотекстовый индекс по названию после загрузки данных"""
+        with self.__connection:
+            self.__connection.executescript("""
+                CREATE INDEX vacancies_year ON vacancies (year, salary);
+                CREATE INDEX vacancies_area ON vacancies (area);
+            """)
+
+        # Токенизатор trigram есть только в SQLite 3.34 и новее, без него поиск идет без полнотекстового индекса
+        try:
+            with self.__connection:
+                self.__connection.execute("""
+                    CREATE VIRTUAL TABLE vacancies_fts USING fts5(
+                        name, content='vacancies', content_rowid='id', tokenize='trigram case_sensitive 1'
+                    )
+                """)
+                self.__connection.execute("INSERT INTO vacancies_fts (vacancies_fts) VALUES ('rebuild')")
+        except sqlite3.OperationalError:
+            self.__fts = False
+
+    def get_vacancies_years(self, name: str = None) -> Dict[str, List[int]]:
+        """Создает словарь с ключами-годами и значениями - массивами из зарплат для вакансий,
+        в названии которых есть name (аналог фильтра Vacancy.is_suitible у DataSet)
+        :param name: Подстрока названия вакансии, None - все вакансии
+        :return: Словарь с массивами зарплат по годам
+        """
+        if name is not None and not isinstance(name, str):
+            raise TypeError('SqliteDataSet фильтрует вакансии только по подстроке названия')
+
+        if name is None:
+            return OtherMethods.get_structured_salaries(
+                [(year, summ, count) for year, (summ, count) in self.__years.items()])
+
+        # Полнотекстовый индекс с триграммами ищет только подстроки длиной от трех символов
+        where = 'WHERE instr(name, :name) > 0'
+        if self.__fts and len(name) >= 3:
+            where += ' AND id IN (SELECT rowid FROM vacancies_fts WHERE vacancies_fts MATCH :match)'
+        params = {'name': name, 'match': '"' + name.replace('"', '""') + '"'}
+
+        query = f'SELECT year, SUM(salary), COUNT(*) FROM vacancies {where} GROUP BY year'
+        filtered = {year: [summ, count] for year, summ, count in self.__connection.execute(query, params)}
+        return OtherMethods.get_structured_salaries(
+            [(year, *filtered.get(year, [0, 0])) for year in self.__years.keys()])
+
+    def get_vacancies_cities(self) -> Tuple[List[List[float]], List[List[int]]]:
+        """Создает кортеж из листов с долями вакансий и уровнем зарплат по городам
+        :return: Кортеж из листов с долями вакансий и уровнем зарплат по городам
+        """
+        rows = self.__connection.execute(
+            'SELECT area, SUM(salary), COUNT(*) FROM vacancies GROUP BY area ORDER BY MIN(id)').fetchall()
+        return OtherMethods.get_structured_cities(rows, self.len)
+
+
+class SampledDataSet:
+    """Класс, представляющий приближенный набор данных о вакансиях, построенный по случайной выборке.
+    Строки csv файла отбираются резервуарной выборкой (отдельно по каждому году при стратификации),
+    и только отобранные строки превращаются в объекты Vacancy. Количество вакансий по годам
+    считается точно, остальные значения оцениваются по выборке с доверительными интервалами.
+    Файл все равно читается целиком, поэтому время загрузки растет с размером файла: точные количества
+    по годам и равновероятная выборка требуют просмотра каждой строки, а выборка по случайным смещениям
+    в файле невозможна, так как поля csv (например, описание вакансии) могут содержать переводы строк.
+    Экономия достигается за счет того, что строки вне выборки не очищаются и не превращаются в Vacancy.
+    """
+    z = 1.96
+
+    def __init__(self, file_name: str, sample_size: int = None, target_error: float = None,
+                 stratified: bool = True, seed: int = None, dedup=None):
+        """Инициализирует объект SampledDataSet
+        :param file_name: Название файла
+        :param sample_size: Размер выборки (для каждого года при стратификации)
+        :param target_error: Допустимая погрешность долей вакансий с уровнем доверия 95%,
+            по ней вычисляется размер выборки, если он не задан
+        :param stratified: Делать ли отдельную выборку для каждого года
+        :param seed: Начальное значение генератора случайных чисел
+        :param dedup: Объект Deduplicator для удаления повторяющихся вакансий, None - без удаления
+        """
+        if sample_size is not None and sample_size <= 0:
+            raise ValueError(f'Размер выборки должен быть положительным: {sample_size}')
+        if target_error is not None and not 0 < target_error < 1:
+            raise ValueError(f'Допустимая погрешность должна быть в интервале (0, 1): {target_error}')
+
+        if sample_size is None:
+            if target_error is None:
+                raise ValueError('Нужно задать размер выборки или допустимую погрешность')
+            sample_size = math.ceil(SampledDataSet.z ** 2 * 0.25 / target_error ** 2)
+
+        self.sample_size = sample_size
+        self.len = 0
+        self.__totals: Dict[str, int] = {}
+        self.__samples: Dict[str, List[Vacancy]] = {}
+
+        random_gen = random.Random(seed)
+        reservoirs: Dict[str, List[List[str]]] = {}
+        seen: Dict[str, int] = {}
+        title = None
+        year_index = None
+
+        for title, row in DataSet.read_rows(file_name):
+            if dedup is not None and dedup.is_duplicate(row, title):
+                continue
+
+            if year_index is None:
+                year_index = title.index('published_at')
+
+            year = row[year_index].strip()[:4]
+            self.__totals[year] = self.__totals.get(year, 0) + 1
+            self.len += 1
+
+            stratum = year if stratified else ''
+            seen[stratum] = seen.get(stratum, 0) + 1
+            reservoir = reservoirs.setdefault(stratum, [])
+            if len(reservoir) < sample_size:
+                reservoir.append(row)
+                continue
+
+            j = random_gen.randrange(seen[stratum])
+            if j < sample_size:
+                reservoir[j] = row
+
+        for reservoir in reservoirs.values():
+            for row in reservoir:
+                vacancy = Vacancy(row, title)
+                self.__samples.setdefault(vacancy.get_date(), []).append(vacancy)
+
+    def get_vacancies_years(self, func=None) -> Dict[str, List[int]]:
+        """Оценивает по выборке словарь с ключами-годами и значениями - массивами из зарплат
+        :param func: Фильтрующая функция или подстрока названия вакансии
+        :return: Словарь с массивами зарплат по годам
+        """
+        return {year: estimate[0] for year, estimate in self.__estimate_years(func).items()}
+
+    def get_vacancies_cities(self) -> Tuple[List[List[float]], List[List[int]]]:
+        """Оценивает по выборке кортеж из листов с долями вакансий и уровнем зарплат по городам
+        :return: Кортеж из листов с долями вакансий и уровнем зарплат по городам
+        """
+        fract, cities_s, _, _ = self.__estimate_cities()
+        return fract, cities_s
+
+    def get_intervals(self, func=None) -> Dict[str, dict]:
+        """Вычисляет полуширину доверительных интервалов для всех оценок
+        :param func: Фильтрующая функция или подстрока названия профессии
+        :return: Словарь с интервалами для s_all и s_filtered (по годам: [зарплата, количество]),
+            fract и cities_s (по городам)
+        """
+        _, _, fract_i, cities_i = self.__estimate_cities()
+        return {
+            's_all': {year: estimate[1] for year, estimate in self.__estimate_years().items()},
+            's_filtered': {year: estimate[1] for year, estimate in self.__estimate_years(func).items()},
+            'fract': fract_i,
+            'cities_s': cities_i,
+        }
+
+    def __estimate_years(self, func=None) -> Dict[str, Tuple[List[int], List[int]]]:
+        """Оценивает зарплаты и количество вакансий по годам
+        :param func: Фильтрующая функция или подстрока названия вакансии
+        :return: Словарь с ключами-годами и значениями - парами из оценки и интервала
+        """
+        func = DataSet.get_filter(func)
+        estimates = {}
+
+        for year, total in self.__totals.items():
+            sample = self.__samples.get(year, [])
+            salaries = [vacancy.get_salary() for vacancy in sample if func is None or func(vacancy)]
+            share = len(salaries) / len(sample) if sample else 0
+
+            count = total if func is None else round(total * share)
+            count_i = 0 if func is None else \
+                math.ceil(total * SampledDataSet.get_share_interval(share, len(sample), total))
+            average = math.floor(sum(salaries) / len(salaries)) if salaries else 0
+            average_i = math.ceil(SampledDataSet.get_mean_interval(salaries, count))
+
+            estimates[year] = ([average, count], [average_i, count_i])
+
+        return estimates
+
+    def __estimate_cities(self):
+        """Оценивает доли вакансий и уровень зарплат по городам. Каждая вакансия из выборки
+        входит в оценку с весом - количеством вакансий ее года, приходящимся на одну вакансию выборки
+        Интервал доли учитывает стратификацию по годам, интервал зарплаты приближенно
+        считается по вакансиям города из выборки без учета весов
+        :return: Доли вакансий, зарплаты по городам и полуширины их интервалов
+        """
+        weights = {}
+        sums = {}
+        salaries = {}
+        counts = {}
+
+        for year, sample in self.__samples.items():
+            weight = self.__totals[year] / len(sample)
+            counts[year] = {}
+            for vacancy in sample:
+                area = vacancy.get_area()
+                counts[year][area] = counts[year].get(area, 0) + 1
+                weights[area] = weights.get(area, 0) + weight
+                sums[area] = sums.get(area, 0) + weight * vacancy.get_salary()
+                salaries.setdefault(area, []).append(vacancy.get_salary())
+
+        fract, cities_s = OtherMethods.get_structured_cities(
+            [(area, sums[area], weight) for area, weight in weights.items()], self.len)
+        fract_i, cities_i = {}, {}
+
+        for area, _ in fract:
+            cities_i[area] = math.ceil(SampledDataSet.get_mean_interval(salaries[area], round(weights[area])))
+            strata = [(counts[year].get(area, 0) / len(sample), len(sample), self.__totals[year])
+                      for year, sample in self.__samples.items()]
+            fract_i[area] = round(SampledDataSet.get_stratified_share_interval(strata), 4)
+
+        return fract, cities_s, fract_i, cities_i
+
+    @staticmethod
+    def get_mean_interval(values: List[float], population: int) -> float:
+        """Вычисляет полуширину доверительного интервала для среднего
+        :param values: Значения из выборки
+        :param population: Размер генеральной совокупности
+        :return: Полуширина интервала
+
+        >>> round(SampledDataSet.get_mean_interval([10, 20, 30, 40], 1000000), 2)
+        12.65
+        >>> SampledDataSet.get_mean_interval([10, 20], 2)
+        0.0
+        """
+        if len(values) < 2:
+            return 0.0
+        return SampledDataSet.z * statistics.stdev(values) / math.sqrt(len(values)) \
+            * SampledDataSet.get_correction(len(values), population)
+
+    @staticmethod
+    def get_share_interval(share: float, size: int, population: int) -> float:
+        """Вычисляет полуширину доверительного интервала для доли
+        :param share: Доля в выборке
+        :param size: Размер выборки
+        :param population: Размер генеральной совокупности
+        :return: Полуширина интервала
+
+        >>> round(SampledDataSet.get_share_interval(0.5, 100, 1000000), 4)
+        0.098
+        """
+        if size == 0:
+            return 0.0
+        return SampledDataSet.z * math.sqrt(share * (1 - share) / size) \
+            * SampledDataSet.get_correction(size, population)
+
+    @staticmethod
+    def get_stratified_share_interval(strata: List[Tuple[float, int, int]]) -> float:
+        """Вычисляет полуширину доверительного интервала для доли по стратифицированной выборке:
+        дисперсия - сумма дисперсий долей в стратах с квадратами весов страт
+        :param strata: Список из доли в выборке страты, размера выборки и размера страты
+        :return: Полуширина интервала
+
+        >>> round(SampledDataSet.get_stratified_share_interval([(0.5, 100, 1000000)]), 4)
+        0.098
+        >>> round(SampledDataSet.get_stratified_share_interval([(0.5, 100, 500000), (0.5, 100, 500000)]), 4)
+        0.0693
+        """
+        population = sum(map(lambda x: x[2], strata))
+        variance = 0
+        for share, size, total in strata:
+            if size == 0:
+                continue
+            variance += (total / population) ** 2 * share * (1 - share) / size \
+                * SampledDataSet.get_correction(size, total) ** 2
+        return SampledDataSet.z * math.sqrt(variance)
+
+    @staticmethod
+    def get_correction(size: int, population: int) -> float:
+        """Вычисляет поправку на конечность генеральной совокупности
+        :param size: Размер выборки
+        :param population: Размер генеральной совокупности
+        :return: Поправка, 0 если выборка совпадает с совокупностью
+        """
+        if population <= size:
+            return 0.0
+        return math.sqrt((population - size) / (population - 1))
+
+
+class PartialAggregate:
+    """Класс, представляющий частичные агрегаты по части (шарду) вакансий: количество вакансий
+    и сумму зарплат по годам, городам и названиям вакансий. Агрегаты разных шардов можно
+    объединить и получить те же данные, что и DataSet для объединенного csv файла.
+    """
+    version = 1
+
+    def __init__(self):
+        """Инициализирует пустой объект PartialAggregate"""
+        self.len = 0
+        self.years: Dict[str, List[float]] = {}
+        self.cities: Dict[str, List[float]] = {}
+        self.professions: Dict[str, Dict[str, List[float]]] = {}
+
+    @staticmethod
+    def from_csv(file_name: str, dedup=None):
+        """Создает частичные агрегаты по csv файлу
+        :param file_name: Название файла
+        :param dedup: Объект Deduplicator для удаления повторяющихся вакансий, None - без удаления
+        :return: Объект PartialAggregate
+        """
+        aggregate = PartialAggregate()
+        for title, row in DataSet.read_rows(file_name):
+            if dedup is not None and dedup.is_duplicate(row, title):
+                continue
+            aggregate.add(Vacancy(row, title))
+        return aggregate
+
+    def add(self, vacancy: Vacancy):
+        """Добавляет вакансию в агрегаты
+        :param vacancy: Вакансия
+        """
+        salary = vacancy.get_salary()
+        year = vacancy.get_date()
+        names = self.professions.setdefault(year, {})
+
+        for totals, key in [(self.years, year), (self.cities, vacancy.get_area()), (names, vacancy.get_name())]:
+            total = totals.setdefault(key, [0, 0])
+            total[0] += salary
+            total[1] += 1
+
+        self.len += 1
+
+    def merge(self, other):
+        """Добавляет к агрегатам агрегаты другого шарда, порядок шардов соответствует порядку строк
+        объединенного файла
+        :param other: Объект PartialAggregate
+        """
+        PartialAggregate.add_totals(self.years, other.years)
+        PartialAggregate.add_totals(self.cities, other.cities)
+        for year, names in other.professions.items():
+            PartialAggregate.add_totals(self.professions.setdefault(year, {}), names)
+
+        self.len += other.len
+
+    @staticmethod
+    def add_totals(totals: Dict[str, List[float]], other: Dict[str, List[float]]):
+        """Прибавляет суммы зарплат и количество вакансий одного словаря к другому
+        :param totals: Словарь, к которому прибавляются значения
+        :param other: Словарь с прибавляемыми значениями
+
+        >>> totals = {'2021': [100.0, 1]}
+        >>> PartialAggregate.add_totals(totals, {'2021': [50.0, 1], '2022': [10.0, 1]})
+        >>> totals
+        {'2021': [150.0, 2], '2022': [10.0, 1]}
+        """
+        for key, (summ, count) in other.items():
+            total = totals.setdefault(key, [0, 0])
+            total[0] += summ
+            total[1] += count
+
+    def save(self, file_name: str):
+        """Сохраняет агрегаты в сжатый json файл
+        :param file_name: Название файла
+        """
+        data = {
+            'version': PartialAggregate.version,
+            'len': self.len,
+            'years': self.years,
+            'cities': self.cities,
+            'professions': self.professions,
+        }
+        with gzip.open(file_name, mode='wt', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, separators=(',', ':'))
+
+    @staticmethod
+    def load(file_name: str):
+        """Загружает агрегаты из файла, сохраненного методом save
+        :param file_name: Название файла
+        :return: Объект PartialAggregate
+        """
+        with gzip.open(file_name, mode='rt', encoding='utf-8') as file:
+            data = json.load(file)
+
+        if data.get('version') != PartialAggregate.version:
+            raise ValueError(f'Неподдерживаемая версия файла агрегатов {file_name}: {data.get("version")}')
+
+        aggregate = PartialAggregate()
+        aggregate.len = data['len']
+        aggregate.years = data['years']
+        aggregate.cities = data['cities']
+        aggregate.professions = data['professions']
+        return aggregate
+
+    def get_vacancies_years(self, name: str = None) -> Dict[str, List[int]]:
+        """Создает словарь с ключами-годами и значениями - массивами из зарплат для вакансий,
+        в названии которых есть name (аналог фильтра Vacancy.is_suitible у DataSet)
+        :param name: Подстрока названия вакансии, None - все вакансии
+        :return: Словарь с массивами зарплат по годам
+        """
+        if name is None:
+            return OtherMethods.get_structured_salaries(
+                [(year, summ, count) for year, (summ, count) in self.years.items()])
+
+        rows = []
+        for year in self.years.keys():
+            totals = [total for key, total in self.professions.get(year, {}).items() if name in key]
+            rows.append((year, sum(map(lambda x: x[0], totals)), sum(map(lambda x: x[1], totals))))
+        return OtherMethods.get_structured_salaries(rows)
+
+    def get_vacancies_cities(self) -> Tuple[List[List[float]], List[List[int]]]:
+        """Создает кортеж из листов с долями вакансий и уровнем зарплат по городам
+        :return: Кортеж из листов с долями вакансий и уровнем зарплат по городам
+        """
+        rows = [(area, summ, count) for area, (summ, count) in self.cities.items()]
+        return OtherMethods.get_structured_cities(rows, self.len)
+
+
+class ArtifactCache:
+    """Класс, представляющий кэш сгенерированных файлов отчетов с адресацией по содержимому.
+    Файлы хранятся под ключом - хэшем входных данных, при превышении размера
+    удаляются давно не использованные записи.
+    """
+
+    def __init__(self, directory: str = '.report_cache', max_size: int = 100 * 1024 * 1024):
+        """Инициализирует объект класса ArtifactCache
+        :param directory: Папка для хранения кэша
+        :param max_size: Максимальный размер кэша в байтах
+        """
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(*parts) -> str:
+        """Вычисляет ключ кэша по входным данным
+        :param parts: Входные данные, сериализуемые в json
+        :return: Ключ кэша
+
+        >>> ArtifactCache.get_key('xlsx', {'2022': [1, 2]}) == ArtifactCache.get_key('xlsx', {'2022': [1, 2]})
+        True
+        >>> ArtifactCache.get_key('xlsx', {'2022': [1, 2]}) == ArtifactCache.get_key('png', {'2022': [1, 2]})
+        False
+        """
+        data = json.dumps(parts, ensure_ascii=False, separators=(',', ':'))
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get_path(self, key: str, file_name: str) -> str:
+        """Получает путь к записи кэша
+        :param key: Ключ кэша
+        :param file_name: Название файла отчета, из него берется расширение
+        :return: Путь к записи кэша
+        """
+        return os.path.join(self.directory, key + os.path.splitext(file_name)[1])
 
-        return dict_salaries
+    def fetch(self, key: str, file_name: str) -> bool:
+        """Отдает файл из кэша жесткой ссылкой или копированием
+        :param key: Ключ кэша
+        :param file_name: Куда положить файл
+        :return: Был ли файл в кэше
+        """
+        path = self.get_path(key, file_name)
+        if not os.path.exists(path):
+            return False
+
+        if os.path.exists(file_name):
+            os.remove(file_name)
+        try:
+            os.link(path, file_name)
+        except OSError:
+            shutil.copyfile(path, file_name)
+
+        os.utime(path)
+        return True
+
+    def store(self, key: str, file_name: str):
+        """Кладет файл в кэш и удаляет лишние записи
+        :param key: Ключ кэша
+        :param file_name: Файл для сохранения
+        """
+        path = self.get_path(key, file_name)
+        temp = f'{path}.{os.getpid()}.tmp'
+        shutil.copyfile(file_name, temp)
+        os.replace(temp, path)
+        self.evict()
+
+    def evict(self):
+        """Удаляет давно не использованные записи, пока размер кэша больше максимального"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        entries.sort()
+        size = sum(map(lambda x: x[1], entries))
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            os.remove(path)
+            size -= entry_size
 
 
 class Report:
     """Класс для представления разлияных видов отчетов"""
+    titles = [
+        'Уровень зарплат по годам',
+        'Количество вакансий по годам',
+        'Уровень зарплат по городам',
+        'Доля вакансий по городам',
+    ]
+    png_settings = {'size': [8, 6], 'dpi': 300}
+
     def __init__(self, vacancy: str,
                  s_all: Dict[str, List[int]],
                  s_filtered: Dict[str, List[int]],
                  fract: List[List[float]],
-                 cities_s: List[List[int]]):
+                 cities_s: List[List[int]],
+                 cache=None,
+                 intervals: Dict[str, dict] = None):
         """Инициализирует объект класса report
         :param vacancy: Вакансия, по которой была произведена фильтрация
         :param s_all: Словарь с ключами-годами и значениями - массивами из зарплат
         :param s_filtered: Словарь с ключами-годами и значениями - массивами из зарплат для выбранной профессии
         :param fract: Доли вакансий по городам
         :param cities_s: Средние зарплаты по городам
+        :param cache: Кэш сгенерированных файлов (ArtifactCache), None - без кэширования
+        :param intervals: Доверительные интервалы приближенных значений (SampledDataSet.get_intervals)
         """
         self.__salaries_all = s_all
         self.__salaries_filtered = s_filtered
         self.__fraction = fract
         self.__cities_salaries = cities_s
         self.__vacancy = vacancy
+        self.__cache = cache
+        self.__intervals = intervals
 
         self.__names_ws1 = {
             'A1': 'Год',
@@ -317,15 +1081,27 @@ class Report:
             'D1': 'Город',
             'E1': 'Доля вакансий'
         }
-        self.__titles = [
-            'Уровень зарплат по годам',
-            'Количество вакансий по годам',
-            'Уровень зарплат по городам',
-            'Доля вакансий по городам',
-        ]
+
+        self.__names_ws3 = {
+            'A1': 'Год',
+            'B1': '± Средняя зарплата',
+            'C1': f'± Средняя зарплата - {vacancy}',
+            'D1': '± Количество вакансий',
+            'E1': f'± Количество вакансий - {vacancy}',
+            'G1': 'Город',
+            'H1': '± Уровень зарплат',
+            'J1': 'Город',
+            'K1': '± Доля вакансий',
+        }
 
     def generate_excel(self):
         """Генерирует excel отчет"""
+        self.save_artifact('report.xlsx', 'xlsx', self.write_excel)
+
+    def write_excel(self, file_name: str):
+        """Строит excel отчет и сохраняет его в файл
+        :param file_name: Название файла
+        """
         wb = Workbook()
         ws1 = wb.active
         ws2 = wb.create_sheet('Статистика по городам')
@@ -333,7 +1109,52 @@ class Report:
         Report.make_first_ws(ws1, self.__salaries_all, self.__salaries_filtered, self.__names_ws1)
         Report.make_second_ws(ws2, self.__fraction, self.__cities_salaries, self.__names_ws2)
 
-        wb.save('report.xlsx')
+        if self.__intervals is not None:
+            ws3 = wb.create_sheet('Доверительные интервалы')
+            Report.make_third_ws(ws3, self.__intervals, self.__fraction, self.__cities_salaries, self.__names_ws3)
+
+        wb.save(file_name)
+
+    def save_artifact(self, file_name: str, kind: str, write) -> bool:
+        """Сохраняет файл отчета, беря его из кэша если входные данные не изменились
+        :param file_name: Название файла
+        :param kind: Вид отчета, входит в ключ кэша
+        :param write: Функция, создающая файл отчета по названию файла
+        :return: Был ли файл взят из кэша
+        """
+        key = None
+        if self.__cache is not None:
+            key = self.get_cache_key(kind)
+            if self.__cache.fetch(key, file_name):
+                return True
+
+        # Файл может оказаться жесткой ссылкой на запись кэша, поэтому его нельзя перезаписывать на месте
+        if os.path.exists(file_name):
+            os.remove(file_name)
+        write(file_name)
+
+        if key is not None:
+            self.__cache.store(key, file_name)
+        return False
+
+    def get_cache_key(self, kind: str) -> str:
+        """Вычисляет ключ кэша по входным данным отчета и настройкам отрисовки
+        :param kind: Вид отчета
+        :return: Ключ кэша
+        """
+        return ArtifactCache.get_key(
+            kind,
+            Report.png_settings if kind == 'png' else None,
+            self.__vacancy,
+            self.__salaries_all,
+            self.__salaries_filtered,
+            self.__fraction,
+            self.__cities_salaries,
+            self.__intervals,
+            Report.titles,
+            self.__names_ws1,
+            self.__names_ws2,
+        )
 
     @staticmethod
     def generate_rows_1(s_all: Dict[str, List[int]], s_filtered: Dict[str, List[int]]) -> List[Dict[str, str | int]]:
@@ -428,6 +1249,39 @@ class Report:
         Report.set_border(ws, f'D1:E{count + 1}')
         Report.normalize_rows(ws)
 
+    @staticmethod
+    def make_third_ws(ws, intervals: Dict[str, dict], fract: List[List[float]], cities_s: List[List[int]],
+                      title: Dict[str, str]):
+        """Заполняет лист excel с доверительными интервалами
+        :param ws: Лист
+        :param intervals: Доверительные интервалы приближенных значений
+        :param fract: Массив с долями вакансий по городам
+        :param cities_s: Массив с уровнем зарплат по городам
+        :param title: Название листа
+        """
+        Report.create_title(ws, title)
+        s_all, s_filtered = intervals['s_all'], intervals['s_filtered']
+        count = 10
+
+        for i, year in enumerate(s_all.keys()):
+            values = [int(year), s_all[year][0], s_filtered[year][0], s_all[year][1], s_filtered[year][1]]
+            for j, value in enumerate(values):
+                ws.cell(row=i + 2, column=j + 1, value=value)
+
+        for i in range(count):
+            if len(cities_s) >= i + 1:
+                ws[f'G{i + 2}'] = cities_s[i][0]
+                ws[f'H{i + 2}'] = intervals['cities_s'][cities_s[i][0]]
+            if len(fract) >= i + 1:
+                ws[f'J{i + 2}'] = fract[i][0]
+                ws[f'K{i + 2}'] = intervals['fract'][fract[i][0]]
+
+        Report.add_percentage(ws, count, 'K')
+        Report.set_border(ws, f'A1:E{len(s_all) + 1}')
+        Report.set_border(ws, f'G1:H{count + 1}')
+        Report.set_border(ws, f'J1:K{count + 1}')
+        Report.normalize_rows(ws)
+
     @staticmethod
     def add_percentage(ws, count: int, column: str):
         """Добавляет процентный формат данных определенному столбцу
@@ -478,6 +1332,17 @@ class Report:
 
     def generate_png(self):
         """Генерирует png c графиками"""
+        if self.save_artifact('graph.png', 'png', self.write_png):
+            # Графики взяты из кэша без отрисовки, поэтому для показа открывается сохраненная картинка
+            fig, ax = plt.subplots()
+            ax.imshow(plt.imread('graph.png'))
+            ax.axis('off')
+        plt.show()
+
+    def write_png(self, file_name: str):
+        """Рисует графики и сохраняет их в файл
+        :param file_name: Название файла
+        """
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(nrows=2, ncols=2)
 
         self.create_bar(
@@ -486,7 +1351,7 @@ class Report:
             self.__salaries_filtered,
             0,
             ['Средняя з/п', f'З/п {self.__vacancy}'],
-            self.__titles[0]
+            self.titles[0]
         )
 
         self.create_bar(
@@ -495,16 +1360,15 @@ class Report:
             self.__salaries_filtered,
             1,
             ['Количество вакансий', f'Количество вакансий {self.__vacancy}'],
-            self.__titles[1]
+            self.titles[1]
         )
 
-        self.create_barh(ax3, self.__cities_salaries[:10], self.__titles[2])
-        self.create_round(ax4, self.__fraction[:10], self.__titles[3])
+        self.create_barh(ax3, self.__cities_salaries[:10], self.titles[2])
+        self.create_round(ax4, self.__fraction[:10], self.titles[3])
         fig.tight_layout()
-        fig.set_size_inches(8, 6)
-        fig.set_dpi(300)
-        fig.savefig('graph.png', dpi=300)
-        plt.show()
+        fig.set_size_inches(*Report.png_settings['size'])
+        fig.set_dpi(Report.png_settings['dpi'])
+        fig.savefig(file_name, dpi=Report.png_settings['dpi'])
 
     @staticmethod
     def create_bar(
@@ -585,12 +1449,117 @@ class Report:
         return list(map(lambda x: x[i], data.values()))
 
 
+class ChartBatch:
+    """Класс для пакетной генерации графиков по нескольким профессиям.
+    Общие для всех профессий части графиков рисуются один раз в каждом процессе,
+    для каждой профессии обновляются только ее столбцы.
+    """
+    _state = None
+
+    def __init__(self,
+                 s_all: Dict[str, List[int]],
+                 fract: List[List[float]],
+                 cities_s: List[List[int]],
+                 directory: str = '.',
+                 workers: int = None):
+        """Инициализирует объект класса ChartBatch
+        :param s_all: Словарь с ключами-годами и значениями - массивами из зарплат
+        :param fract: Доли вакансий по городам
+        :param cities_s: Средние зарплаты по городам
+        :param directory: Папка для сохранения графиков
+        :param workers: Количество процессов, при значении 1 графики рисуются в текущем процессе
+        """
+        self.__salaries_all = s_all
+        self.__fraction = fract
+        self.__cities_salaries = cities_s
+        self.__directory = directory
+        self.__workers = workers
+
+    def generate_png(self, professions: Dict[str, Dict[str, List[int]]]) -> List[str]:
+        """Генерирует png c графиками для каждой профессии
+        :param professions: Словарь с ключами-профессиями и значениями - зарплатами по годам для профессии
+        :return: Список путей к сохраненным графикам
+        """
+        tasks = [(vacancy, s_filtered, self.get_file_name(vacancy))
+                 for vacancy, s_filtered in professions.items()]
+        file_names = [task[2] for task in tasks]
+        if len(set(file_names)) != len(file_names):
+            raise ValueError('Названия профессий дают одинаковые имена файлов графиков')
+        init_args = (self.__salaries_all, self.__fraction, self.__cities_salaries)
+
+        if self.__workers == 1:
+            ChartBatch.init_worker(*init_args)
+            return [ChartBatch.render(task) for task in tasks]
+
+        workers = self.__workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=ChartBatch.init_worker,
+                                 initargs=init_args) as executor:
+            return list(executor.map(ChartBatch.render, tasks, chunksize=max(1, len(tasks) // workers)))
+
+    def get_file_name(self, vacancy: str) -> str:
+        """Получает путь к графику для профессии
+        :param vacancy: Название профессии
+        :return: Путь к файлу
+        """
+        name = re.sub(r'[^\w-]+', '_', vacancy).strip('_')
+        # Разные названия могут совпасть после замены символов, поэтому к ним добавляется хэш исходного названия
+        if name != vacancy:
+            name += '_' + hashlib.sha256(vacancy.encode('utf-8')).hexdigest()[:8]
+        return os.path.join(self.__directory, f'graph_{name}.png')
+
+    @staticmethod
+    def init_worker(s_all: Dict[str, List[int]], fract: List[List[float]], cities_s: List[List[int]]):
+        """Рисует общие для всех профессий графики, вызывается один раз в каждом процессе
+        :param s_all: Словарь с ключами-годами и значениями - массивами из зарплат
+        :param fract: Доли вакансий по городам
+        :param cities_s: Средние зарплаты по городам
+        """
+        fig = Figure()
+        ((ax1, ax2), (ax3, ax4)) = fig.subplots(nrows=2, ncols=2)
+        empty = {year: [0, 0] for year in s_all.keys()}
+
+        Report.create_bar(ax1, s_all, empty, 0, ['Средняя з/п', 'З/п'], Report.titles[0])
+        Report.create_bar(ax2, s_all, empty, 1, ['Количество вакансий', 'Количество вакансий'], Report.titles[1])
+        Report.create_barh(ax3, cities_s[:10], Report.titles[2])
+        Report.create_round(ax4, fract[:10], Report.titles[3])
+        fig.tight_layout()
+        fig.set_size_inches(*Report.png_settings['size'])
+
+        ChartBatch._state = {
+            'figure': fig,
+            'years': list(s_all.keys()),
+            'axes': [(ax1, 0, 'З/п'), (ax2, 1, 'Количество вакансий')],
+        }
+
+    @staticmethod
+    def render(task: Tuple[str, Dict[str, List[int]], str]) -> str:
+        """Обновляет столбцы профессии на заранее нарисованных графиках и сохраняет png
+        :param task: Название профессии, зарплаты по годам для профессии, путь к файлу
+        :return: Путь к сохраненному графику
+        """
+        vacancy, s_filtered, file_name = task
+        state = ChartBatch._state
+
+        for ax, index, legend in state['axes']:
+            for rect, year in zip(ax.containers[1], state['years']):
+                rect.set_height(s_filtered.get(year, [0, 0])[index])
+            ax.get_legend().get_texts()[1].set_text(f'{legend} {vacancy}')
+            ax.relim()
+            ax.autoscale_view()
+
+        state['figure'].savefig(file_name, dpi=Report.png_settings['dpi'])
+        return file_name
+
+
 class Console:
     """Класс, представляющий взаимодействие с консолью
     Attributes:
         file_name (str): Название файла
         vacancy (str): Название профессии для фильтрации
         method (str): Метод вывода данных
+        dedup (bool): Удалять ли повторяющиеся вакансии
+        sample_size (int): Размер выборки для приближенного отчета, None - точный отчет по всем вакансиям
     """
 
     def __init__(self):
@@ -598,30 +1567,53 @@ class Console:
         self.file_name = None
         self.vacancy = None
         self.method = None
+        self.dedup = False
+        self.sample_size = None
 
     def read_console(self):
         """Читает данные с консоли"""
         self.file_name = input("Введите название файла: ")
         self.vacancy = input("Введите название профессии: ")
         self.method = input("Вакансии или статистика: ")
+        self.dedup = input("Удалять повторяющиеся вакансии (да/нет): ").lower() == 'да'
+        self.sample_size = Console.read_sample_size()
 
     @staticmethod
-    def write_console(s_all, s_filtered, fract, cities_s):
+    def read_sample_size():
+        """Читает с консоли размер выборки, пока не будет введено положительное целое число или пустая строка
+        :return: Размер выборки, None - точный отчет по всем вакансиям
+        """
+        while True:
+            sample_size = input("Размер выборки для приближенного отчета (пусто - все вакансии): ").strip()
+            if not sample_size:
+                return None
+            try:
+                if int(sample_size) > 0:
+                    return int(sample_size)
+            except ValueError:
+                pass
+            print('Размер выборки должен быть положительным целым числом')
+
+    @staticmethod
+    def write_console(s_all, s_filtered, fract, cities_s, intervals=None):
         """Выводит вакансии в консоль
         :param s_all: Словарь с ключами-годами и значениями - массивами из зарплат
         :param s_filtered: Словарь с ключами-годами и значениями - массивами из зарплат для выбранной профессии
         :param fract: Доли вакансий по городам
         :param cities_s: Средние зарплаты по городам
+        :param intervals: Доверительные интервалы приближенных значений (SampledDataSet.get_intervals)
         """
-        Console.write_salaries(s_all)
-        Console.write_salaries(s_filtered, ' для выбранной профессии')
-        Console.write_salaries_cities(fract, cities_s)
+        intervals = intervals if intervals is not None else {}
+        Console.write_salaries(s_all, intervals=intervals.get('s_all'))
+        Console.write_salaries(s_filtered, ' для выбранной профессии', intervals.get('s_filtered'))
+        Console.write_salaries_cities(fract, cities_s, intervals.get('fract'), intervals.get('cities_s'))
 
     @staticmethod
-    def write_salaries(salaries: Dict[str, List[int]], sufix=''):
+    def write_salaries(salaries: Dict[str, List[int]], sufix='', intervals: Dict[str, List[int]] = None):
         """Выводит в консоль словарь с ключами-годами и значениями - массивами из зарплат
         :param salaries: Словарь с ключами-годами и значениями - массивами из зарплат
         :param sufix: Доп параметр для печати
+        :param intervals: Словарь с ключами-годами и значениями - полуширинами интервалов
         """
         s = f'Динамика уровня зарплат по годам{sufix}' + ': {'
         print(s, end='')
@@ -631,6 +1623,8 @@ class Console:
                 print(', ', end='')
 
             print(f'{year}: {salaries[year][0]}', end='')
+            if intervals is not None:
+                print(f' ± {intervals[year][0]}', end='')
         print('}')
 
         s = f'Динамика количества вакансий по годам{sufix}' + ': {'
@@ -640,19 +1634,26 @@ class Console:
             if i != 0:
                 print(', ', end='')
             print(f'{year}: {salaries[year][1]}', end='')
+            if intervals is not None:
+                print(f' ± {intervals[year][1]}', end='')
         print('}')
 
     @staticmethod
-    def write_salaries_cities(fract: List[List[float]], cities_s: List[List[int]]):
+    def write_salaries_cities(fract: List[List[float]], cities_s: List[List[int]],
+                              fract_i: Dict[str, float] = None, cities_i: Dict[str, int] = None):
         """Выводит уровень зарплат и доли вакансий по городам в консоль
         :param fract: Доля вакансий по городам
         :param cities_s: Средние зарплаты по городам
+        :param fract_i: Полуширины интервалов долей вакансий по городам
+        :param cities_i: Полуширины интервалов зарплат по городам
         """
         print('Уровень зарплат по городам (в порядке убывания): {', end='')
         for i, e in enumerate(cities_s[:10]):
             if i != 0:
                 print(', ', end='')
             print(f"'{e[0]}': {e[1]}", end='')
+            if cities_i is not None:
+                print(f' ± {cities_i[e[0]]}', end='')
         print('}')
 
         print('Доля вакансий по городам (в порядке убывания): {', end='')
@@ -660,6 +1661,8 @@ class Console:
             if i != 0:
                 print(', ', end='')
             print(f"'{e[0]}': {e[1]}", end='')
+            if fract_i is not None:
+                print(f' ± {fract_i[e[0]]}', end='')
         print('}')
 
 
@@ -667,22 +1670,31 @@ if __name__ == '__main__':
     connect = Console()
     connect.read_console()
 
-    dataset = DataSet(connect.file_name)
+    dedup = Deduplicator() if connect.dedup else None
+    if connect.sample_size is None:
+        dataset = DataSet(connect.file_name, dedup)
+    else:
+        dataset = SampledDataSet(connect.file_name, connect.sample_size, dedup=dedup)
+    if dedup is not None:
+        print(dedup)
 
     salaries_all = dataset.get_vacancies_years()
-    salaries_filter = dataset.get_vacancies_years(lambda x: x.is_suitible(connect.vacancy))
+    salaries_filter = dataset.get_vacancies_years(connect.vacancy)
     fraction, cities_salaries = dataset.get_vacancies_cities()
+    intervals = dataset.get_intervals(connect.vacancy) if connect.sample_size is not None else None
 
     report = Report(connect.vacancy,
                  salaries_all,
                  salaries_filter,
                  fraction,
-                 cities_salaries
+                 cities_salaries,
+                 ArtifactCache(),
+                 intervals
                  )
 
     if connect.method.lower() != 'статистика':
         report.generate_excel()
         report.generate_png()
     else:
-        connect.write_console(salaries_all, salaries_filter, fraction, cities_salaries)
+        connect.write_console(salaries_all, salaries_filter, fraction, cities_salaries, intervals)
         report.generate_excel()
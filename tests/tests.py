@@ -1,5 +1,9 @@
+import os
+import tempfile
 import unittest
-from program import Salary, Vacancy, DataSet, OtherMethods
+from program import Salary, Vacancy, DataSet, OtherMethods, ChartBatch, ArtifactCache, Report, \
+    Deduplicator, BloomFilter, SqliteDataSet, SampledDataSet, \
+    PartialAggregate
 
 
 class SalaryTests(unittest.TestCase):
@@ -86,5 +90,264 @@ class TestOtherMethods(unittest.TestCase):
         self.assertEqual(OtherMethods.normalize_label('Санкт-Петербург'), 'Санкт-\nПетербург')
 
 
+class CsvTestCase(unittest.TestCase):
+    """Базовый класс для тестов, читающих вакансии из временных csv файлов"""
+    title = 'name,employer_name,salary_from,salary_to,salary_currency,area_name,published_at'
+
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_csv(self, rows: list, name: str = 'vacancies.csv') -> str:
+        file_name = os.path.join(self.directory, name)
+        with open(file_name, 'w', encoding='utf-8') as file:
+            file.write('\n'.join([self.title] + rows) + '\n')
+        return file_name
+
+
+class TestDeduplicator(CsvTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        row = 'Аналитик,Яндекс,80000,100000,RUR,Москва,2022-07-17T18:23:06+0300'
+        self.file_name = self.write_csv([row, row, row.replace('Москва', 'Казань')])
+
+    def test_dataset_without_dedup(self):
+        self.assertEqual(DataSet(self.file_name).len, 3)
+
+    def test_dataset_with_exact_dedup(self):
+        dedup = Deduplicator()
+        self.assertEqual(DataSet(self.file_name, dedup).len, 2)
+        self.assertEqual(dedup.removed, 1)
+
+    def test_dataset_with_bloom_dedup(self):
+        dedup = Deduplicator(capacity=100, error_rate=0.01)
+        self.assertEqual(DataSet(self.file_name, dedup).len, 2)
+        self.assertEqual(dedup.removed, 1)
+
+    def test_reused_with_other_column_order(self):
+        dedup = Deduplicator(['name', 'area_name'])
+        self.assertFalse(dedup.is_duplicate(['Аналитик', 'Москва'], ['name', 'area_name']))
+        self.assertFalse(dedup.is_duplicate(['Москва', 'Аналитик2'], ['area_name', 'name']))
+        self.assertTrue(dedup.is_duplicate(['Москва', 'Аналитик'], ['area_name', 'name']))
+
+    def test_missing_key_column(self):
+        with self.assertRaisesRegex(ValueError, 'premium'):
+            DataSet(self.file_name, Deduplicator(['name', 'premium']))
+
+    def test_bloom_filter_invalid_arguments(self):
+        for capacity, error_rate in [(0, 0.01), (100, 0), (100, 1)]:
+            with self.assertRaises(ValueError):
+                BloomFilter(capacity, error_rate)
+
+    def test_bloom_filter_memory(self):
+        self.assertLess(BloomFilter(100000, 0.01).get_memory(), 150000)
+
+
+class TestSqliteDataSet(CsvTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.file_name = self.write_csv([
+            'Аналитик данных,Яндекс,80000,100000,RUR,Москва,2021-07-17T18:23:06+0300',
+            'Программист,Сбер,1000,2000,EUR,Москва,2022-07-17T18:23:06+0300',
+            'Старший аналитик,Тинькофф,50000,70000,RUR,Казань,2022-01-10T10:00:00+0300',
+            'Ан,Озон,10000,20000,RUR,Пермь,2020-01-10T10:00:00+0300',
+        ])
+        self.dataset = DataSet(self.file_name)
+        self.sqlite = SqliteDataSet(self.file_name, batch_size=2)
+        self.addCleanup(self.sqlite.close)
+
+    def test_length(self):
+        self.assertEqual(self.sqlite.len, self.dataset.len)
+
+    def test_years_without_filter(self):
+        self.assertEqual(self.sqlite.get_vacancies_years(), self.dataset.get_vacancies_years())
+
+    def test_years_with_filter(self):
+        for name in ['аналитик', 'Ан', 'Программист', 'Нет такой']:
+            self.assertEqual(self.sqlite.get_vacancies_years(name),
+                             self.dataset.get_vacancies_years(lambda x: x.is_suitible(name)))
+            self.assertEqual(self.sqlite.get_vacancies_years(name), self.dataset.get_vacancies_years(name))
+
+    def test_years_with_function_filter(self):
+        with self.assertRaises(TypeError):
+            self.sqlite.get_vacancies_years(lambda x: x.is_suitible('Ан'))
+
+    def test_temporary_database_removed_on_close(self):
+        with SqliteDataSet(self.file_name) as sqlite:
+            self.assertEqual(sqlite.len, 4)
+            database = sqlite.__dict__['_SqliteDataSet__temp_name']
+            self.assertTrue(os.path.exists(database))
+        self.assertFalse(os.path.exists(database))
+
+    def test_cities(self):
+        self.assertEqual(self.sqlite.get_vacancies_cities(), self.dataset.get_vacancies_cities())
+
+
+class TestSampledDataSet(CsvTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.file_name = self.write_csv([
+            f'{"Аналитик" if i % 4 == 0 else "Менеджер"},Яндекс,{1000 * i},{1000 * i + 2000},RUR,'
+            f'{"Москва" if i % 3 == 0 else "Казань"},{2020 + i % 3}-07-17T18:23:06+0300' for i in range(200)])
+        self.dataset = DataSet(self.file_name)
+        self.func = lambda x: x.is_suitible('Аналитик')
+
+    def test_full_sample_is_exact(self):
+        sampled = SampledDataSet(self.file_name, sample_size=1000)
+        self.assertEqual(sampled.get_vacancies_years(), self.dataset.get_vacancies_years())
+        self.assertEqual(sampled.get_vacancies_years(self.func), self.dataset.get_vacancies_years(self.func))
+        self.assertEqual(sampled.get_vacancies_cities(), self.dataset.get_vacancies_cities())
+        self.assertEqual(sampled.get_intervals(self.func)['s_filtered']['2020'], [0, 0])
+
+    def test_name_filter_matches_function_filter(self):
+        sampled = SampledDataSet(self.file_name, sample_size=10, seed=1)
+        self.assertEqual(sampled.get_vacancies_years('Аналитик'), sampled.get_vacancies_years(self.func))
+        self.assertEqual(sampled.get_intervals('Аналитик'), sampled.get_intervals(self.func))
+
+    def test_counts_by_year_are_exact(self):
+        sampled = SampledDataSet(self.file_name, sample_size=10, seed=1)
+        self.assertEqual(sampled.len, 200)
+        self.assertEqual(
+            {year: value[1] for year, value in sampled.get_vacancies_years().items()},
+            {year: value[1] for year, value in self.dataset.get_vacancies_years().items()})
+
+    def test_sample_size_from_target_error(self):
+        self.assertEqual(SampledDataSet(self.file_name, target_error=0.1).sample_size, 97)
+
+    def test_sample_size_required(self):
+        with self.assertRaises(ValueError):
+            SampledDataSet(self.file_name)
+
+    def test_invalid_sampling_arguments(self):
+        for arguments in [{'sample_size': 0}, {'sample_size': -3}, {'target_error': 0}, {'target_error': 1}]:
+            with self.assertRaises(ValueError):
+                SampledDataSet(self.file_name, **arguments)
+
+
+class TestPartialAggregate(CsvTestCase):
+
+    def setUp(self) -> None:
+        super().setUp()
+        rows = [f'{"Аналитик данных" if i % 4 == 0 else "Менеджер"},Яндекс,{1000 * i},{1000 * i + 2000},'
+                f'{"EUR" if i % 5 == 0 else "RUR"},{["Москва", "Казань", "Пермь"][i % 3]},'
+                f'{2020 + i % 3}-07-17T18:23:06+0300' for i in range(60)]
+        self.shards = [rows[:25], rows[25:]]
+        self.file_name = self.write_csv(rows, 'all.csv')
+        self.shard_names = [self.write_csv(shard, f'shard{i}.csv') for i, shard in enumerate(self.shards)]
+
+    def merge_shards(self) -> PartialAggregate:
+        aggregate = PartialAggregate()
+        for i, shard_name in enumerate(self.shard_names):
+            output = os.path.join(self.directory, f'shard{i}.json.gz')
+            PartialAggregate.from_csv(shard_name).save(output)
+            aggregate.merge(PartialAggregate.load(output))
+        return aggregate
+
+    def test_merge_matches_concatenated_data(self):
+        dataset = DataSet(self.file_name)
+        aggregate = self.merge_shards()
+        self.assertEqual(aggregate.len, dataset.len)
+        self.assertEqual(aggregate.get_vacancies_years(), dataset.get_vacancies_years())
+        self.assertEqual(aggregate.get_vacancies_years('Аналитик'),
+                         dataset.get_vacancies_years(lambda x: x.is_suitible('Аналитик')))
+        self.assertEqual(aggregate.get_vacancies_cities(), dataset.get_vacancies_cities())
+
+    def test_load_unsupported_version(self):
+        output = os.path.join(self.directory, 'old.json.gz')
+        PartialAggregate.from_csv(self.shard_names[0]).save(output)
+        PartialAggregate.version += 1
+        try:
+            with self.assertRaises(ValueError):
+                PartialAggregate.load(output)
+        finally:
+            PartialAggregate.version -= 1
+
+
+class TestChartBatch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.s_all = {'2021': [100, 10], '2022': [200, 20]}
+        self.fract = [['Москва', 0.6], ['Санкт-Петербург', 0.4]]
+        self.cities_s = [['Москва', 150], ['Санкт-Петербург', 120]]
+        self.batch = ChartBatch(self.s_all, self.fract, self.cities_s, self.directory.name, workers=1)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_file_name(self):
+        self.assertEqual(os.path.basename(self.batch.get_file_name('Программист')), 'graph_Программист.png')
+
+    def test_file_name_without_collisions(self):
+        self.assertNotEqual(self.batch.get_file_name('C++'), self.batch.get_file_name('C#'))
+        self.assertTrue(os.path.basename(self.batch.get_file_name('C++')).startswith('graph_C_'))
+
+    def test_one_image_per_profession(self):
+        files = self.batch.generate_png({
+            'Аналитик': {'2021': [90, 3], '2022': [110, 4]},
+            'Программист': {'2021': [300, 5], '2022': [400, 6]},
+        })
+        self.assertEqual(len(files), 2)
+        self.assertTrue(all(os.path.getsize(file) > 0 for file in files))
+
+    def test_one_image_per_profession_in_pool(self):
+        batch = ChartBatch(self.s_all, self.fract, self.cities_s, self.directory.name, workers=2)
+        professions = {f'Профессия {i}': {'2021': [i, 1], '2022': [2 * i, 2]} for i in range(3)}
+        files = batch.generate_png(professions)
+        self.assertEqual(files, [batch.get_file_name(vacancy) for vacancy in professions])
+        self.assertTrue(all(os.path.getsize(file) > 0 for file in files))
+
+
+class TestArtifactCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ArtifactCache(os.path.join(self.directory.name, 'cache'), max_size=10)
+        self.file_name = os.path.join(self.directory.name, 'report.txt')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, text: str):
+        with open(self.file_name, 'w') as file:
+            file.write(text)
+
+    def test_fetch_when_missing(self):
+        self.assertFalse(self.cache.fetch('key', self.file_name))
+
+    def test_fetch_after_store(self):
+        self.write('12345')
+        self.cache.store('key', self.file_name)
+        os.remove(self.file_name)
+        self.assertTrue(self.cache.fetch('key', self.file_name))
+        with open(self.file_name) as file:
+            self.assertEqual(file.read(), '12345')
+
+    def test_evict_least_recently_used(self):
+        self.write('12345')
+        self.cache.store('old', self.file_name)
+        os.utime(self.cache.get_path('old', self.file_name), (0, 0))
+        self.cache.store('new', self.file_name)
+        self.cache.store('newest', self.file_name)
+        self.assertFalse(os.path.exists(self.cache.get_path('old', self.file_name)))
+        self.assertTrue(os.path.exists(self.cache.get_path('newest', self.file_name)))
+
+    def test_report_served_from_cache(self):
+        s_all = {'2022': [100, 10]}
+        fract = [[f'Город {i}', 0.1] for i in range(10)]
+        cities_s = [[f'Город {i}', 100] for i in range(10)]
+        report = Report('Аналитик', s_all, {'2022': [90, 3]}, fract, cities_s, self.cache)
+        self.cache.max_size = 10 * 1024 * 1024
+        file_name = os.path.join(self.directory.name, 'report.xlsx')
+
+        self.assertFalse(report.save_artifact(file_name, 'xlsx', report.write_excel))
+        self.assertTrue(report.save_artifact(file_name, 'xlsx', self.fail))
+        self.assertTrue(os.path.getsize(file_name) > 0)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file